@@ -39,11 +39,13 @@ def flatten(files, matches=None):
     res = []
     if not isinstance(files, list):
         files = [files]
+    files = [os.path.expanduser(entry) for entry in files]
+    dirs = fs.isdir_many(files)
+    regular = fs.isfile_many([entry for entry in files if not dirs[entry]])
     for entry in files:
-        entry = os.path.expanduser(entry)
-        if fs.isdir(entry):
+        if dirs[entry]:
             res.extend(fs.ls(entry))
-        elif fs.isfile(entry):
+        elif regular[entry]:
             res.append(entry)
     if matches:
         return [fn for fn in res if matchfn(fn)]
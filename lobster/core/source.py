@@ -354,7 +354,7 @@ class TaskProvider(util.Timing):
             jdir = util.taskdir(wflow.workdir, id)
             inputs = list(self._inputs)
             inputs.append((os.path.join(jdir, 'parameters.json'), 'parameters.json', False))
-            outputs = [(os.path.join(jdir, f), f) for f in ['report.json']]
+            outputs = [(os.path.join(jdir, 'report.json'), 'report.json')]
 
             monitorid, syncid = registration[id]
 
@@ -396,7 +396,7 @@ class TaskProvider(util.Timing):
 
                 for task, _, _, _ in lumis:
                     report = self.get_report(label, task)
-                    _, infile = list(wflow.get_outputs(task))[0]
+                    _, infile = next(wflow.get_outputs(task))
 
                     if os.path.isfile(report):
                         inreports.append(report)
@@ -1,9 +1,9 @@
 import collections
-import gzip
 import json
 import logging
 import os
 import work_queue as wq
+import zlib
 
 from lobster import util
 from lobster.core.dataset import FileInfo
@@ -16,6 +16,21 @@ __all__ = ['TaskHandler', 'MergeTaskHandler', 'ProductionTaskHandler']
 logger = logging.getLogger('lobster.cmssw.taskhandler')
 
 
+def write_gzip(filename, data, chunksize=65536):
+    """Write gzip compressed data to a file.
+
+    Compresses `data` in chunks of `chunksize` bytes with `zlib`, which
+    emits the gzip framing itself, and streams the result to disk.  This
+    avoids holding a second copy of large logs in memory.  Uses the
+    fastest compression level, since logs compress well regardless.
+    """
+    compressor = zlib.compressobj(1, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    with open(filename, 'wb') as f:
+        for n in xrange(0, len(data), chunksize):
+            f.write(compressor.compress(buffer(data, n, chunksize)))
+        f.write(compressor.flush())
+
+
 class TaskHandler(object):
 
     """
@@ -191,9 +206,7 @@ class TaskHandler(object):
 
         # Save wrapper output
         if task.output:
-            f = gzip.open(os.path.join(self.taskdir, 'task.log.gz'), 'wb')
-            f.write(task.output)
-            f.close()
+            write_gzip(os.path.join(self.taskdir, 'task.log.gz'), task.output)
 
         # CMS stats to update
         files_info = {}
@@ -18,6 +18,12 @@ import work_queue as wq
 
 logger = logging.getLogger('lobster.workflow')
 
+# Additional inputs of every merge task
+merge_inputs = [
+    (os.path.join(os.path.dirname(__file__), 'data', 'merge_reports.py'), 'merge_reports.py', True),
+    (os.path.join(os.path.dirname(__file__), 'data', 'task.py'), 'task.py', True)
+]
+
 
 class Category(Configurable):
 
@@ -439,6 +445,9 @@ class Workflow(Configurable):
         self.version = versions.pop()
 
         self.copy_inputs(basedirs)
+
+        self._shared_inputs = self.__build_shared_inputs()
+
         autoOutputs = False
         autoGlobalTag = False
         if self.outputs == None:
@@ -454,6 +463,16 @@ class Workflow(Configurable):
         if not os.path.exists(self.workdir):
             os.makedirs(self.workdir)
 
+    def __build_shared_inputs(self):
+        """Returns the sandbox inputs, with the hash removed from the
+        sandbox names, and the extra inputs shared by all tasks.
+        """
+        sandbox_inputs = [
+            (box, os.path.basename(box).rsplit('-', 1)[0] + '.tar.bz2', True) for box in self.sandboxes
+        ]
+        extra_inputs = [(i, os.path.basename(i), True) for i in self.extra_inputs]
+        return sandbox_inputs, extra_inputs
+
     def handler(self, id_, files, lumis, taskdir, merge=False):
         if merge:
             return MergeTaskHandler(id_, self.label, files, lumis, list(self.get_outputs(id_)), taskdir)
@@ -474,10 +493,11 @@ class Workflow(Configurable):
             return TaskHandler(id_, self.label, files, lumis, list(self.get_outputs(id_)), taskdir, local=self.local)
 
     def get_outputs(self, id):
+        fmt = self.output_format.format
+        prefix = os.path.join(self.label, '')
         for fn in self.outputs:
             base, ext = os.path.splitext(fn)
-            outfn = self.output_format.format(base=base, ext=ext[1:], id=id)
-            yield fn, os.path.join(self.label, outfn)
+            yield fn, prefix + fmt(base=base, ext=ext[1:], id=id)
 
     def adjust(self, params, env, taskdir, inputs, outputs, merge, reports=None, unique=None):
         cmd = self.command
@@ -486,13 +506,16 @@ class Workflow(Configurable):
 
         env['LOBSTER_CMSSW_VERSION'] = self.version
 
-        for box in self.sandboxes:
-            # Remove the hash from the sandbox name
-            cleaned = os.path.basename(box).rsplit('-', 1)[0] + '.tar.bz2'
-            inputs.append((box, cleaned, True))
+        # Projects created before the shared inputs were stored during
+        # setup do not have them in their pickled configuration
+        shared_inputs = getattr(self, '_shared_inputs', None)
+        if shared_inputs is None:
+            shared_inputs = self.__build_shared_inputs()
+        sandbox_inputs, extra_inputs = shared_inputs
+
+        inputs.extend(sandbox_inputs)
         if merge:
-            inputs.append((os.path.join(os.path.dirname(__file__), 'data', 'merge_reports.py'), 'merge_reports.py', True))
-            inputs.append((os.path.join(os.path.dirname(__file__), 'data', 'task.py'), 'task.py', True))
+            inputs.extend(merge_inputs)
             inputs.extend((r, "_".join(os.path.normpath(r).split(os.sep)[-3:]), False) for r in reports)
 
             cmd = self.merge_command
@@ -504,14 +527,14 @@ class Workflow(Configurable):
                 if cmd == 'hadd':
                     args = ['-n', '0', '-f'] + args
                 else:
-                    inputs.extend((i, os.path.basename(i), True) for i in self.extra_inputs)
+                    inputs.extend(extra_inputs)
                 pset = None
 
             params['prologue'] = None
             params['epilogue'] = ['python', 'merge_reports.py', 'report.json'] \
                 + ["_".join(os.path.normpath(r).split(os.sep)[-3:]) for r in reports]
         else:
-            inputs.extend((i, os.path.basename(i), True) for i in self.extra_inputs)
+            inputs.extend(extra_inputs)
 
             if unique:
                 params['arguments_unique'] = shlex.split(unique)
@@ -1,18 +1,27 @@
+import itertools
 import logging
 import os
 import random
 import re
+import stat
 if 'LOBSTER_SKIP_HADOOP' not in os.environ:
     import snakebite.client
     import snakebite.errors
 import subprocess
-import xml.dom.minidom
+import threading
+import time
 
 from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
 from lobster.util import Configurable
 
 import Chirp as chirp
 
+try:
+    from lxml import etree
+except ImportError:
+    import xml.etree.cElementTree as etree
+
 
 logger = logging.getLogger('lobster.se')
 
@@ -20,6 +29,82 @@ logger = logging.getLogger('lobster.se')
 # the path
 url_re = re.compile(r'^([a-z]+)://([^/]*)(.*)/?$')
 
+# Matches CMS tiered computing site as found in
+# /cvmfs/cms.cern.ch/SITECONF/
+site_re = re.compile(r'^T[0123]_(?:[A-Z]{2}_)?[A-Za-z0-9_\-]+$')
+
+# Matches relative paths consisting only of parent directory references
+parent_re = re.compile(r'^..(?:/..)*$')
+
+# Parsed SITECONF storage mappings, keyed by filename
+_siteconf_cache = {}
+
+
+def _load_siteconf(filename):
+    """Load the LFN to PFN translation rules of a SITECONF storage mapping.
+
+    The file is only parsed again if its modification time changed.
+
+    Returns
+    -------
+        rules : list
+            A list of tuples `(protocol, destination_match, path_match,
+            result)`, with the patterns compiled.  A missing
+            `destination_match` is represented by `None`.
+    """
+    mtime = os.stat(filename).st_mtime
+    try:
+        cached, rules = _siteconf_cache[filename]
+        if cached == mtime:
+            return rules
+    except KeyError:
+        pass
+
+    rules = []
+    for _, e in etree.iterparse(filename):
+        if e.tag != 'lfn-to-pfn' or 'path-match' not in e.attrib:
+            continue
+        destination = e.get('destination-match')
+        rules.append((
+            e.get('protocol'),
+            re.compile(destination) if destination is not None else None,
+            re.compile(e.get('path-match')),
+            e.get('result').replace('$1', r'\1')
+        ))
+        e.clear()
+    _siteconf_cache[filename] = (mtime, rules)
+    return rules
+
+
+# LFN to PFN rules applicable to a protocol at a site, keyed by protocol
+# and site
+_site_cache = {}
+
+
+def _site_rules(protocol, site):
+    """Get the LFN to PFN translation rules of a site for a protocol.
+
+    Returns
+    -------
+        rules : list
+            A list of tuples `(path_match, result)`, with `path_match`
+            compiled.
+    """
+    rules = _load_siteconf(os.path.join('/cvmfs/cms.cern.ch/SITECONF', site, 'PhEDEx/storage.xml'))
+    try:
+        source, matches = _site_cache[(protocol, site)]
+        if source is rules:
+            return matches
+    except KeyError:
+        pass
+
+    matches = [
+        (regexp, result) for proto, destination, regexp, result in rules
+        if proto == protocol and (destination is None or destination.match(site))
+    ]
+    _site_cache[(protocol, site)] = (rules, matches)
+    return matches
+
 
 class FileSystem(object):
 
@@ -33,20 +118,35 @@ class FileSystem(object):
     _defaults = []
     _alternatives = []
 
+    # Maps method names to the implementations of the active storage
+    # elements providing them, in order
+    _methods = {}
+
     def __init__(self):
         self.__file__ = __file__
         self.__name__ = 'fs'
 
+    @classmethod
+    def _resolve(cls, attr):
+        try:
+            return cls._methods[attr]
+        except KeyError:
+            methods = [(imp, getattr(imp, attr)) for imp in cls._defaults if hasattr(imp, attr)]
+            cls._methods[attr] = methods
+            return methods
+
     def __getattr__(self, attr):
         if attr in self.__dict__:
             return self.__dict__[attr]
 
         def switch(*args, **kwargs):
             logger.debug("resolving file system method '{0}' with arguments {1!r}, {2!r}".format(attr, args, kwargs))
+            if attr.endswith('_many'):
+                return many(args[0], **kwargs)
             lasterror = None
-            for imp in FileSystem._defaults:
+            for imp, method in FileSystem._resolve(attr):
                 try:
-                    return imp.fixresult(getattr(imp, attr)(*map(imp.lfn2pfn, args), **kwargs))
+                    return imp.fixresult(method(*map(imp.lfn2pfn, args), **kwargs))
                 except imp.errors as e:
                     logger.debug(
                         "method {0} of {1} failed with {2}, using args {3}, {4}".format(attr, imp, e, args, kwargs))
@@ -57,6 +157,25 @@ class FileSystem(object):
                     lasterror = e
             raise AttributeError(
                 "no resolution found for method '{0}' with arguments '{1}': {2}".format(attr, args, lasterror))
+
+        def many(lfns, **kwargs):
+            # batched methods take a list of paths and return a dictionary
+            # keyed by path.  Only the first storage element is handed the
+            # whole batch: a failure does not tell which paths it could not
+            # handle, and later storage elements may answer for paths they
+            # do not hold.  Should it fail, the paths are resolved one at a
+            # time, each by the first storage element able to handle it.
+            for imp, method in FileSystem._resolve(attr)[:1]:
+                try:
+                    pfns = dict((lfn, imp.lfn2pfn(lfn)) for lfn in lfns)
+                    res = method(pfns.values(), **kwargs)
+                    return dict((lfn, res[pfn]) for lfn, pfn in pfns.items())
+                except imp.errors + (TypeError,) as e:
+                    logger.debug(
+                        "method {0} of {1} failed with {2}, resolving paths one at a time".format(attr, imp, e))
+            single = getattr(self, attr[:-len('_many')])
+            return dict((lfn, single(lfn, **kwargs)) for lfn in lfns)
+
         return switch
 
     def lfn2pfn(self, lfn, instance):
@@ -81,15 +200,17 @@ class FileSystem(object):
         """
         cls._defaults = defaults
         cls._alternatives = alternatives
+        cls._methods = {}
 
     @contextmanager
     def alternative(self):
-        tmp = FileSystem._defaults
+        tmp = FileSystem._defaults, FileSystem._methods
         FileSystem._defaults = FileSystem._alternatives
+        FileSystem._methods = {}
         try:
             yield
         finally:
-            FileSystem._defaults = tmp
+            FileSystem._defaults, FileSystem._methods = tmp
 
 
 class StorageElement(object):
@@ -100,6 +221,13 @@ class StorageElement(object):
     implementations.
     """
 
+    # Number of threads used to perform batched operations.  Set to 1 for
+    # implementations that are not thread-safe or not latency bound.
+    workers = 32
+
+    # Maximum number of LFN to PFN translations to remember
+    cachesize = 100000
+
     def __init__(self, pfnprefix):
         """Baseclass of a storage element.
 
@@ -112,37 +240,105 @@ class StorageElement(object):
         self._pfnprefix = pfnprefix
         if not self._pfnprefix.endswith('/'):
             self._pfnprefix += '/'
+        self._pfns = {}
 
     @property
     def errors(self):
         return (IOError, OSError)
 
     def lfn2pfn(self, path):
+        """Translate a path into a physical file name.
+
+        Translations are cached, since the same paths tend to be accessed
+        repeatedly.  The cache is dropped when it grows beyond `cachesize`
+        entries.
+        """
+        try:
+            return self._pfns[path]
+        except KeyError:
+            pass
+        if len(self._pfns) >= self.cachesize:
+            self._pfns.clear()
+        pfn = self._pfns[path] = self._lfn2pfn(path)
+        return pfn
+
+    def _lfn2pfn(self, path):
         if path.startswith('/'):
             p = os.path.join(self._pfnprefix, path[1:])
         else:
             p = os.path.join(self._pfnprefix, path)
         m = url_re.match(p)
         if m:
-            protocol, server, path = url_re.match(p).groups()
+            protocol, server, path = m.groups()
             path = os.path.normpath(path)
             return "{0}://{1}{2}".format(protocol, server, path)
         return os.path.normpath(p)
 
-    def fixresult(self, res):
-        def pfn2lfn(p):
-            return p.replace(self._pfnprefix, '', 1)
+    def pfn2lfn(self, path):
+        return path.replace(self._pfnprefix, '', 1)
 
+    def fixresult(self, res):
         if isinstance(res, basestring):
-            return pfn2lfn(res)
+            return self.pfn2lfn(res)
 
         try:
-            return map(pfn2lfn, res)
+            return map(self.pfn2lfn, res)
         except TypeError:
             return res
 
+    def map(self, method, paths):
+        """Apply a method to many paths.
+
+        Overlaps the calls in a thread pool, if supported by the
+        implementation.  The pool is sized to the number of paths, up to
+        `workers`, and shut down once all calls returned, releasing
+        per-thread state like server connections.
+
+        Parameters
+        ----------
+            method : str
+                The name of the method to call.
+            paths : list
+                The paths to pass to the method, one at a time.
+
+        Returns
+        -------
+            results : list
+                The results of the method calls, in the order of `paths`.
+        """
+        fct = getattr(self, method)
+        paths = list(paths)
+        if self.workers < 2 or len(paths) < 2:
+            return [fct(p) for p in paths]
+        pool = ThreadPool(min(self.workers, len(paths)))
+        try:
+            return pool.map(fct, paths)
+        finally:
+            pool.close()
+            pool.join()
+
+    def _many(self, method, paths):
+        paths = list(paths)
+        return dict(zip(paths, self.map(method, paths)))
+
+    def exists_many(self, paths):
+        """Batched version of `exists`, returning a dictionary of paths to
+        results.  Implementations may override these to amortize the cost
+        of remote operations.
+        """
+        return self._many('exists', paths)
+
+    def getsize_many(self, paths):
+        return self._many('getsize', paths)
+
+    def isdir_many(self, paths):
+        return self._many('isdir', paths)
+
+    def isfile_many(self, paths):
+        return self._many('isfile', paths)
+
     def makedirs(self, path):
-        if re.match(r'^..(?:/..)*$', path):
+        if parent_re.match(path):
             if len(path) > 2 + 100 * 3:
                 # fail for excessive path recursion
                 raise NotImplementedError
@@ -161,21 +357,27 @@ class StorageElement(object):
 
 class Local(StorageElement):
 
+    workers = 1
+
     def __init__(self, pfnprefix=''):
         super(Local, self).__init__(pfnprefix)
         self.exists = os.path.exists
         self.getsize = os.path.getsize
-        self.isdir = self._guard(os.path.isdir)
-        self.isfile = self._guard(os.path.isfile)
 
-    def _guard(self, method):
-        """Protect method against non-existent paths.
+    def _mode(self, path):
+        """Get the mode of a path with a single `stat`, raising an
+        `IOError` for non-existent paths.
         """
-        def guarded(path):
-            if not os.path.exists(path):
-                raise IOError("path does not exist: {0}".format(path))
-            return method(path)
-        return guarded
+        try:
+            return os.stat(path).st_mode
+        except OSError:
+            raise IOError("path does not exist: {0}".format(path))
+
+    def isdir(self, path):
+        return stat.S_ISDIR(self._mode(path))
+
+    def isfile(self, path):
+        return stat.S_ISREG(self._mode(path))
 
     def ls(self, path):
         for fn in os.listdir(path):
@@ -199,6 +401,8 @@ class Local(StorageElement):
 
 class Hadoop(StorageElement):
 
+    workers = 1
+
     def __init__(self, host, port, pfnprefix='/hadoop'):
         super(Hadoop, self).__init__(pfnprefix)
         self.__c = snakebite.client.Client(host, int(port))
@@ -260,7 +464,23 @@ class Chirp(StorageElement):
     def __init__(self, server, pfnprefix):
         super(Chirp, self).__init__(pfnprefix)
 
-        self.__c = chirp.Client(server, timeout=10)
+        self.__server = server
+        self.__local = threading.local()
+        self.__local.client = chirp.Client(server, timeout=10)
+
+    @property
+    def errors(self):
+        return (IOError, OSError, chirp.AuthenticationFailure)
+
+    @property
+    def __c(self):
+        """The connection to the server, one per thread.
+        """
+        try:
+            return self.__local.client
+        except AttributeError:
+            self.__local.client = chirp.Client(self.__server, timeout=10)
+            return self.__local.client
 
     def exists(self, path):
         try:
@@ -273,10 +493,10 @@ class Chirp(StorageElement):
         return self.__c.stat(str(path)).size
 
     def isdir(self, path):
-        return len(self.__c.ls(str(path))) > 0
+        return stat.S_ISDIR(self.__c.stat(str(path)).mode)
 
     def isfile(self, path):
-        return len(self.__c.ls(str(path))) == 0
+        return stat.S_ISREG(self.__c.stat(str(path)).mode)
 
     def ls(self, path):
         for f in self.__c.ls(str(path)):
@@ -298,14 +518,28 @@ class Chirp(StorageElement):
 
 class SRM(StorageElement):
 
+    # Maximum number of concurrent processes spawned by `execute_many`
+    concurrency = 20
+
+    # Seconds for which the output of `gfal-stat` is reused
+    stat_lifetime = 30
+
+    # Command line prefixes for the commands passed to `execute`
+    commands = {
+        'ls': ['gfal-ls'],
+        'mkdir -p': ['gfal-mkdir', '-p'],
+        'rm -r': ['gfal-rm', '-r'],
+        'stat': ['gfal-stat']
+    }
+
     def __init__(self, pfnprefix):
         super(SRM, self).__init__(pfnprefix)
+        self._stats = {}
 
     def execute(self, cmd, *paths, **kwargs):
-        cmds = cmd.split()
-        args = ['gfal-' + cmds[0]] + cmds[1:] + list(paths)
+        args = self.commands[cmd] + list(paths)
         try:
-            p = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env={})
+            p = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env={})
             pout, err = p.communicate()
             if p.returncode != 0 and not kwargs.get('safe', False):
                 msg = "Failed to execute '{0}':\n{1}\n{2}".format(' '.join(args), err, pout)
@@ -314,46 +548,165 @@ class SRM(StorageElement):
             raise AttributeError("srm utilities not available")
         return pout
 
-    def exists(self, path):
+    def execute_many(self, cmd, paths, safe=False):
+        """Execute a command for many paths.
+
+        The `gfal` utilities only accept a single path for most commands,
+        so one process per path is spawned, with up to `concurrency`
+        processes running at the same time.  This overlaps the latency
+        of the server round-trips.
+
+        Parameters
+        ----------
+            cmd : str
+                The command to execute, one of the keys of `commands`.
+            paths : list
+                The paths to run the command for.
+            safe : bool
+                Ignore failures.  Paths for which the command failed will
+                be omitted from the result.
+
+        Returns
+        -------
+            output : dict
+                A dictionary mapping paths to the command output.
+        """
+        res, errors = self._execute_many(cmd, paths)
+        if errors and not safe:
+            raise IOError('\n'.join(errors[p] for p in paths if p in errors))
+        return res
+
+    def _execute_many(self, cmd, paths):
+        """Execute a command for many paths, returning dictionaries that map
+        paths to the command output and to the error message of failed
+        commands.
+        """
+        prefix = self.commands[cmd]
+        paths = list(paths)
+        res = {}
+        errors = {}
+        for n in range(0, len(paths), self.concurrency):
+            procs = []
+            for path in paths[n:n + self.concurrency]:
+                args = prefix + [path]
+                try:
+                    p = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                         stderr=subprocess.PIPE, env={})
+                except OSError:
+                    errors[path] = "srm utilities not available"
+                    continue
+                procs.append((path, args, p))
+            for path, args, p in procs:
+                pout, err = p.communicate()
+                if p.returncode == 0:
+                    res[path] = pout
+                else:
+                    errors[path] = "Failed to execute '{0}':\n{1}\n{2}".format(' '.join(args), err, pout)
+        return res, errors
+
+    def _filetype(self, output):
         try:
-            self.execute('stat', path)
-            return True
-        except Exception:
-            return False
+            return output.splitlines()[1]
+        except IndexError:
+            return ''
+
+    def _stat_many(self, paths):
+        """Stat many paths, returning a dictionary of paths to tuples of the
+        output of `gfal-stat` and the error message, one of which is
+        `None`.
+
+        Successful results are cached for `stat_lifetime` seconds, so
+        that checking if a path exists and then if it is a directory only
+        requires one round-trip to the server.  Failures are not cached,
+        as they may be transient.
+        """
+        now = time.time()
+        res = {}
+        missing = []
+        for p in paths:
+            try:
+                timestamp, output, error = self._stats[p]
+                if now - timestamp < self.stat_lifetime:
+                    res[p] = (output, error)
+                    continue
+            except KeyError:
+                pass
+            missing.append(p)
+        if missing:
+            found, errors = self._execute_many('stat', missing)
+            if len(self._stats) + len(missing) > self.cachesize:
+                for p, (timestamp, _, _) in self._stats.items():
+                    if now - timestamp >= self.stat_lifetime:
+                        del self._stats[p]
+                if len(self._stats) + len(missing) > self.cachesize:
+                    self._stats.clear()
+            for p in missing:
+                res[p] = (found.get(p), errors.get(p))
+                if p in found:
+                    self._stats[p] = (now, found[p], None)
+        return res
+
+    def stat_many(self, paths):
+        """Stat many paths, returning a dictionary of paths to the output
+        of `gfal-stat`.  Paths that could not be accessed are omitted.
+        """
+        return dict((p, output) for p, (output, error) in self._stat_many(paths).items() if output is not None)
+
+    def exists_many(self, paths):
+        found = self.stat_many(paths)
+        return dict((p, p in found) for p in paths)
+
+    def getsize_many(self, paths):
+        stats = self._stat_many(paths)
+        errors = [stats[p][1] for p in paths if stats[p][0] is None]
+        if errors:
+            raise IOError('\n'.join(errors))
+        return dict((p, stats[p][0].splitlines()[1].split()[1]) for p in paths)
+
+    def isdir_many(self, paths):
+        found = self.stat_many(paths)
+        return dict((p, 'directory' in self._filetype(found.get(p, ''))) for p in paths)
+
+    def isfile_many(self, paths):
+        found = self.stat_many(paths)
+        return dict((p, 'regular file' in self._filetype(found.get(p, ''))) for p in paths)
+
+    def _stat(self, path):
+        output, error = self._stat_many([path])[path]
+        if output is None:
+            raise IOError(error)
+        return output
+
+    def exists(self, path):
+        return self.exists_many([path])[path]
 
     def getsize(self, path):
-        output = self.execute('stat', path)
+        output = self._stat(path)
         return output.splitlines()[1].split()[1]
 
     def isdir(self, path):
-        try:
-            output = self.execute('stat', path)
-            return 'directory' in output.splitlines()[1]
-        except Exception:
-            return False
+        return self.isdir_many([path])[path]
 
     def isfile(self, path):
-        try:
-            output = self.execute('stat', path)
-            return 'regular file' in output.splitlines()[1]
-        except Exception:
-            return False
+        return self.isfile_many([path])[path]
 
     def ls(self, path):
-        for p in self.execute('ls', path).splitlines():
-            yield os.path.join(path, p)
+        prefix = os.path.join(path, '')
+        return [prefix + p for p in self.execute('ls', path).splitlines()]
 
     def mkdir(self, path, mode=None):
+        self._stats.clear()
         self.execute('mkdir -p', path)
 
     def permissions(self, path):
-        output = self.execute('stat', path)
+        output = self._stat(path)
         try:
             return int(output.splitlines()[2][9:13], 8)
         except IndexError:
             raise IOError
 
     def remove(self, *paths):
+        self._stats.clear()
         while len(paths) != 0:
             # FIXME safe is active because SRM does not care about directories.
             self.execute('rm -r', *(paths[:50]), safe=True)
@@ -362,11 +715,20 @@ class SRM(StorageElement):
 
 class XrootD(StorageElement):
 
+    # Arguments to `xrdfs` for the commands passed to `execute`
+    commands = {
+        'ls': ['ls'],
+        'mkdir -p': ['mkdir', '-p'],
+        'rm': ['rm'],
+        'rmdir': ['rmdir'],
+        'stat': ['stat']
+    }
+
     def __init__(self, pfnprefix):
         super(XrootD, self).__init__(pfnprefix)
 
     def execute(self, cmd, *paths, **kwargs):
-        cmds = cmd.split()
+        cmds = self.commands[cmd]
 
         output = []
         for path in paths:
@@ -374,7 +736,7 @@ class XrootD(StorageElement):
             protocol, server, path = url_re.match(path).groups()
             args = ['xrdfs', server] + cmds + [path]
             try:
-                p = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env={})
+                p = subprocess.Popen(args, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env={})
                 pout, err = p.communicate()
                 if p.returncode != 0 and not kwargs.get('safe', False):
                     msg = "Failed to execute '{0}':\n{1}\n{2}".format(' '.join(args), err, pout)
@@ -516,10 +878,6 @@ class StorageConfiguration(Configurable):
         'root': 'xrootd'
     }
 
-    # Matches CMS tiered computing site as found in
-    # /cvmfs/cms.cern.ch/SITECONF/
-    __site_re = re.compile(r'^T[0123]_(?:[A-Z]{2}_)?[A-Za-z0-9_\-]+$')
-
     def __init__(self,
                  output,
                  input=None,
@@ -551,24 +909,15 @@ class StorageConfiguration(Configurable):
     def _find_match(self, protocol, site, path):
         """Extracts the LFN to PFN translation from the SITECONF.
 
-        >>> StorageConfiguration({})._find_match('xrootd', 'T3_US_NotreDame', '/store/user/spam/ham/eggs')
-        (u'/+store/(.*)', u'root://xrootd.unl.edu//store/\\\\1')
+        >>> regexp, result = StorageConfiguration({})._find_match('xrootd', 'T3_US_NotreDame', '/store/user/spam/ham/eggs')
+        >>> regexp.pattern, result
+        ('/+store/(.*)', 'root://xrootd.unl.edu//store/\\\\1')
         """
-        file = os.path.join('/cvmfs/cms.cern.ch/SITECONF', site, 'PhEDEx/storage.xml')
-        doc = xml.dom.minidom.parse(file)
-
-        for e in doc.getElementsByTagName("lfn-to-pfn"):
-            if e.attributes["protocol"].value != protocol:
-                continue
-            if 'destination-match' in e.attributes.keys() and \
-                    not re.match(e.attributes['destination-match'].value, site):
-                continue
-            if path and len(path) > 0 and \
-                    'path-match' in e.attributes.keys() and \
-                    re.match(e.attributes['path-match'].value, path) is None:
+        for regexp, result in _site_rules(protocol, site):
+            if path and len(path) > 0 and regexp.match(path) is None:
                 continue
 
-            return e.attributes["path-match"].value, e.attributes["result"].value.replace('$1', r'\1')
+            return regexp, result
         raise AttributeError(
             "No match found for protocol {0} at site {1}, using {2}".format(protocol, site, path))
 
@@ -580,9 +929,9 @@ class StorageConfiguration(Configurable):
         """
         protocol, server, path = url_re.match(url).groups()
 
-        if self.__site_re.match(server) and protocol in self.__protocols:
+        if site_re.match(server) and protocol in self.__protocols:
             regexp, result = self._find_match(self.__protocols[protocol], server, path)
-            return re.sub(regexp, result, path)
+            return regexp.sub(result, path)
 
         if path.endswith('/'):
             path = path[:-1]
@@ -600,7 +949,7 @@ class StorageConfiguration(Configurable):
         return self.use_work_queue_for_outputs
 
     def local(self, filename):
-        for url in self.input + self.output:
+        for url in itertools.chain(self.input, self.output):
             protocol, server, path = url_re.match(url).groups()
 
             if protocol != 'file':
@@ -655,13 +1004,15 @@ class StorageConfiguration(Configurable):
         merge : bool
             Specify if this is a merging parameter set.
         """
+        inputs = self.input
+        outputs = self.output
         if self.shuffle_inputs:
-            random.shuffle(self.input)
+            inputs = random.sample(inputs, len(inputs))
         if self.shuffle_outputs or (self.shuffle_inputs and merge):
-            random.shuffle(self.output)
+            outputs = random.sample(outputs, len(outputs))
 
-        parameters['input'] = self.input if not merge else self.output
-        parameters['output'] = self.output
+        parameters['input'] = inputs if not merge else outputs
+        parameters['output'] = outputs
         parameters['disable streaming'] = self.disable_input_streaming
         if not self.disable_stage_in_acceleration:
             parameters['accelerate stage-in'] = 3
@@ -1,8 +1,11 @@
 from collections import defaultdict, Counter
+import gzip
 import os
+import shutil
+import tempfile
 import unittest
 
-from lobster.core.task import TaskHandler
+from lobster.core.task import TaskHandler, write_gzip
 from lobster.core.source import ReleaseSummary
 
 
@@ -36,3 +39,29 @@ class TestTask(unittest.TestCase):
                                  (1, 276), (1, 277), (1, 278), (1, 279), (1, 280)]
         assert outinfo.events == 4000
         assert outinfo.size == 15037503
+
+
+class TestWriteGzip(unittest.TestCase):
+
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir)
+
+    def roundtrip(self, data):
+        filename = os.path.join(self.workdir, 'task.log.gz')
+        write_gzip(filename, data)
+        f = gzip.open(filename, 'rb')
+        try:
+            return f.read()
+        finally:
+            f.close()
+
+    def test_empty(self):
+        assert self.roundtrip('') == ''
+
+    def test_multiple_chunks(self):
+        data = '\n'.join('line {0}'.format(n) for n in range(50000))
+        assert len(data) > 65536
+        assert self.roundtrip(data) == data
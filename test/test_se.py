@@ -126,5 +126,146 @@ class TestFailure(TestSE):
         self.query(['file:///fuckup', 'file://' + self.workdir])
 
 
+class LenientLocal(se.Local):
+
+    """Local implementation answering `False` for missing paths instead
+    of raising, like remote storage elements do.
+    """
+
+    def isdir(self, path):
+        return os.path.isdir(path)
+
+
+class TestBatchFallback(unittest.TestCase):
+
+    def setUp(self):
+        self.roots = [tempfile.mkdtemp(), tempfile.mkdtemp()]
+        os.makedirs(os.path.join(self.roots[0], 'spam'))
+        os.makedirs(os.path.join(self.roots[1], 'ham'))
+
+    def tearDown(self):
+        se.FileSystem.configure([], [])
+        for root in self.roots:
+            shutil.rmtree(root)
+
+    def test_raising(self):
+        se.FileSystem.configure([se.Local(r) for r in self.roots], [])
+        assert fs.isdir_many(['spam', 'ham']) == {'spam': True, 'ham': True}
+        with self.assertRaises(AttributeError):
+            fs.isdir_many(['spam', 'eggs'])
+
+    def test_lenient(self):
+        se.FileSystem.configure([se.Local(self.roots[0]), LenientLocal(self.roots[1])], [])
+        assert fs.isdir('spam')
+        assert fs.isdir_many(['spam', 'ham']) == {'spam': True, 'ham': True}
+        assert fs.isdir_many(['spam', 'eggs']) == {'spam': True, 'eggs': False}
+
+
+class CountingSRM(se.SRM):
+
+    """SRM implementation recording calls instead of running `gfal`.
+    """
+
+    def __init__(self):
+        super(CountingSRM, self).__init__('srm://example.org/store')
+        self.calls = []
+
+    def execute(self, cmd, *paths, **kwargs):
+        self.calls.append((cmd, paths))
+        return ''
+
+    def _execute_many(self, cmd, paths):
+        self.calls.append((cmd, tuple(paths)))
+        found = dict((p, "  File: '{0}'\n  Size: 4\tregular file\n".format(p)) for p in paths if 'missing' not in p)
+        errors = dict((p, 'no such file: ' + p) for p in paths if 'missing' in p)
+        return found, errors
+
+
+class TestSRMStatCache(unittest.TestCase):
+
+    def runTest(self):
+        srm = CountingSRM()
+        assert srm.exists('spam')
+        assert srm.isfile('spam')
+        assert not srm.isdir('spam')
+        assert srm.getsize('spam') == '4'
+        assert len(srm.calls) == 1
+
+        with self.assertRaisesRegexp(IOError, 'no such file: missing'):
+            srm.getsize('missing')
+        assert not srm.exists('missing')
+        assert len(srm.calls) == 3
+
+        srm.remove('ham')
+        assert srm.exists('spam')
+        assert len(srm.calls) == 5
+
+        srm.stat_lifetime = 0
+        assert srm.exists('spam')
+        assert len(srm.calls) == 6
+
+        srm.stat_lifetime = 30
+        srm.cachesize = 2
+        srm.remove('ham')
+        srm.stat_many(['spam', 'eggs'])
+        srm.stat_many(['bacon'])
+        assert len(srm._stats) == 1
+
+
+class TestSRMUnavailable(unittest.TestCase):
+
+    def runTest(self):
+        srm = se.SRM('srm://example.org/store')
+        srm.commands = {'stat': [os.path.join(tempfile.gettempdir(), 'no-gfal-stat')]}
+        assert not srm.exists('spam')
+        assert not srm.isdir('spam')
+        with self.assertRaisesRegexp(IOError, 'srm utilities not available'):
+            srm.getsize('spam')
+
+
+class TestPreprocess(unittest.TestCase):
+
+    def runTest(self):
+        urls = ['file:///spam{0}'.format(n) for n in range(10)]
+        s = se.StorageConfiguration(output=urls, input=urls, shuffle_inputs=True, shuffle_outputs=True)
+        inputs = list(s.input)
+        outputs = list(s.output)
+        for merge in (False, True):
+            for _ in range(10):
+                parameters = {}
+                s.preprocess(parameters, merge)
+                assert sorted(parameters['input']) == sorted(inputs)
+                assert sorted(parameters['output']) == sorted(outputs)
+                assert parameters['input'] is not s.input
+                assert parameters['output'] is not s.output
+        assert s.input == inputs
+        assert s.output == outputs
+
+
+class TestSiteconf(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.siteconf = tempfile.mkstemp(suffix='.xml')
+        with os.fdopen(fd, 'w') as f:
+            f.write("""<storage-mapping>
+  <lfn-to-pfn protocol="file" path-match="/+store/(.*)" result="file:/store/$1"/>
+  <lfn-to-pfn protocol="xrootd" destination-match=".*"
+    path-match="/+store/(.*)" result="root://xrootd.unl.edu//store/$1"/>
+</storage-mapping>
+""")
+
+    def tearDown(self):
+        os.unlink(self.siteconf)
+
+    def runTest(self):
+        rules = se._load_siteconf(self.siteconf)
+        assert len(rules) == 2
+        protocol, destination, regexp, result = rules[1]
+        assert protocol == 'xrootd'
+        assert destination.match('T3_US_NotreDame')
+        assert regexp.sub(result, '/store/user/spam') == 'root://xrootd.unl.edu//store/user/spam'
+        assert se._load_siteconf(self.siteconf) is rules
+
+
 if __name__ == '__main__':
     unittest.main()